@@ -2,10 +2,13 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 from datetime import datetime, timedelta
+import logging
+import os
 from backend.app.reddit_client import fetch_subreddit_data
-from transformers import pipeline
-from backend.app.db import SessionLocal
+from backend.app.db import SessionLocal, copy_rows, engine
 from backend.app.models import Prediction, Post
+from backend.app.rollups import refresh_rollups
+from sqlalchemy import exists
 
 default_args = {
     "owner": "airflow",
@@ -14,21 +17,133 @@ default_args = {
     "retry_delay": timedelta(minutes=5),
 }
 
-def predict_emotions(**kwargs):
-    pipe = pipeline("text-classification", model="bhadresh-savani/albert-base-v2-emotion")
-    session = SessionLocal()
-    posts = session.query(Post).all()
-    for post in posts:
-        res = pipe(post.title[:512])[0]
-        pred = Prediction(
-            post_id=post.id,
-            emotion=res["label"],
-            score=res["score"],
-            created_utc=int(datetime.utcnow().timestamp())
+EMOTION_MODEL = "bhadresh-savani/albert-base-v2-emotion"
+# directory written by scripts/export_onnx.py; unset to run the PyTorch model
+EMOTION_ONNX_DIR = os.getenv("EMOTION_ONNX_DIR")
+# dynamic int8 quantization of the PyTorch model's Linear layers; ignored on GPU
+EMOTION_QUANTIZE = os.getenv("EMOTION_QUANTIZE", "0") == "1"
+# torch.compile the PyTorch model; pays a one-off compile in every task process
+EMOTION_COMPILE = os.getenv("EMOTION_COMPILE", "0") == "1"
+BATCH_SIZE = 32
+COMMIT_EVERY = 500
+POSTS_PER_TASK = 2000
+MAX_PARALLEL_PREDICTIONS = 4
+
+log = logging.getLogger(__name__)
+
+_pipe = None
+
+def get_pipe():
+    # load the model lazily, once per task process (Airflow runs each task instance in its own);
+    # torch/transformers are imported here so DAG parsing stays cheap
+    global _pipe
+    if _pipe is not None:
+        return _pipe
+
+    import torch
+    from transformers import pipeline
+
+    if EMOTION_ONNX_DIR:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        from transformers import AutoTokenizer
+
+        # the avx512_vnni dynamic-int8 export is a CPU artifact; on CUDA its quantized
+        # ops would fall back to CPU with host/device copies
+        _pipe = pipeline(
+            "text-classification",
+            model=ORTModelForSequenceClassification.from_pretrained(
+                EMOTION_ONNX_DIR,
+                file_name="model_quantized.onnx",
+                provider="CPUExecutionProvider"
+            ),
+            tokenizer=AutoTokenizer.from_pretrained(EMOTION_ONNX_DIR),
+            batch_size=BATCH_SIZE
         )
-        session.add(pred)
-    session.commit()
+    else:
+        use_cuda = torch.cuda.is_available()
+        _pipe = pipeline(
+            "text-classification",
+            model=EMOTION_MODEL,
+            batch_size=BATCH_SIZE,
+            device=0 if use_cuda else -1,
+            torch_dtype=torch.float16 if use_cuda else torch.float32
+        )
+        if EMOTION_QUANTIZE and not use_cuda:
+            _pipe.model = torch.quantization.quantize_dynamic(
+                _pipe.model, {torch.nn.Linear}, dtype=torch.qint8
+            ).eval()
+        else:
+            try:
+                # fused attention kernels that skip compute on padding tokens
+                _pipe.model = _pipe.model.to_bettertransformer()
+            except (ImportError, ValueError):
+                # optimum missing or architecture unsupported; keep the eager model
+                pass
+        if EMOTION_COMPILE:
+            # dynamic shapes: title batches vary in length and would otherwise recompile
+            _pipe.model = torch.compile(_pipe.model, dynamic=True)
+    return _pipe
+
+def classify(pipe, texts, seen):
+    # seen: title -> pipeline result for this task, so a title repeated across its pages is scored once
+    misses = sorted({text for text in texts if text not in seen}, key=len)
+    if misses:
+        # length-sorted batches pad each forward only to similar-length neighbours
+        for text, res in zip(misses, pipe(misses, batch_size=BATCH_SIZE)):
+            seen[text] = res
+    return [seen[text] for text in texts]
+
+def unpredicted(query):
+    return query.filter(~exists().where(Prediction.post_id == Post.id))
+
+def plan_prediction_batches(**kwargs):
+    # split unpredicted posts into contiguous id ranges, one mapped predict task each
+    session = SessionLocal()
+    ids = [post_id for (post_id,) in unpredicted(session.query(Post.id)).order_by(Post.id)]
     session.close()
+    return [
+        {"first_id": ids[i], "last_id": ids[min(i + POSTS_PER_TASK, len(ids)) - 1]}
+        for i in range(0, len(ids), POSTS_PER_TASK)
+    ]
+
+def predict_emotions(first_id=None, last_id=None, **kwargs):
+    pipe = get_pipe()
+    session = SessionLocal()
+    query = unpredicted(session.query(Post.id, Post.title))
+    if first_id is not None:
+        query = query.filter(Post.id >= first_id)
+    if last_id is not None:
+        query = query.filter(Post.id <= last_id)
+    now = int(datetime.utcnow().timestamp())
+
+    # keyset-paginate so only one chunk of posts is in memory at a time
+    cursor = None
+    seen = {}
+    total = 0
+    while True:
+        page = query if cursor is None else query.filter(Post.id > cursor)
+        chunk = page.order_by(Post.id).limit(COMMIT_EVERY).all()
+        if not chunk:
+            break
+        results = classify(pipe, [title[:512] for _, title in chunk], seen)
+        total += len(chunk)
+        rows = [
+            {
+                "post_id": post_id,
+                "emotion": res["label"],
+                "score": res["score"],
+                "created_utc": now,
+            }
+            for (post_id, _), res in zip(chunk, results)
+        ]
+        copy_rows(session, Prediction, rows)
+        session.commit()
+        cursor = chunk[-1][0]
+    session.close()
+    log.info("Scored %d unique titles for %d posts", len(seen), total)
+
+def refresh_rollup(**kwargs):
+    refresh_rollups(engine)
 
 with DAG(
     "reddit_sentiment_shift",
@@ -43,8 +158,19 @@ with DAG(
         op_kwargs={"subreddit_name": "CryptoCurrency", "limit": 100}
     )
     t2 = PythonOperator(
+        task_id="plan_predictions",
+        python_callable=plan_prediction_batches
+    )
+    t3 = PythonOperator.partial(
         task_id="predict_emotion",
-        python_callable=predict_emotions
+        python_callable=predict_emotions,
+        max_active_tis_per_dag=MAX_PARALLEL_PREDICTIONS
+    ).expand(op_kwargs=t2.output)
+    t4 = PythonOperator(
+        task_id="refresh_rollup",
+        python_callable=refresh_rollup,
+        # an empty expansion skips predict_emotion; the rollup should still refresh
+        trigger_rule="none_failed"
     )
 
-    t1 >> t2
+    t1 >> t2 >> t3 >> t4
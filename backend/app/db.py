@@ -1,8 +1,89 @@
 # backend/app/db.py
+import csv
+import io
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import sessionmaker
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# per-process pool, sized so concurrent requests and DAG tasks do not queue on connections
+engine = create_engine(
+    DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20"))
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# rows per INSERT statement; keeps bind parameters well under Postgres' 65535 limit
+UPSERT_CHUNK = 10000
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _copy(cursor, table_name, columns, rows):
+    buf = io.StringIO()
+    values = [[row[c] for c in columns] for row in rows]
+    # QUOTE_NONNUMERIC writes None as a quoted "" that COPY would load as '' (or reject for ints)
+    if any(v is None for row in values for v in row):
+        raise ValueError(f"COPY into {table_name} does not support NULL values")
+    # quote every string so COPY keeps empty strings instead of reading them as NULL
+    csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC).writerows(values)
+    buf.seek(0)
+    cursor.copy_expert(
+        f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH CSV", buf
+    )
+
+def copy_rows(session, model, rows):
+    # COPY FROM STDIN is the fastest bulk load on Postgres; other backends use executemany
+    if not rows:
+        return
+    if session.get_bind().dialect.driver != "psycopg2":
+        session.bulk_insert_mappings(model, rows)
+        return
+
+    with session.connection().connection.cursor() as cursor:
+        _copy(cursor, model.__tablename__, list(rows[0]), rows)
+
+def upsert_rows(session, model, rows, update_columns):
+    # INSERT ... ON CONFLICT (id) DO UPDATE, one statement per chunk instead of a merge per row
+    # dedupe first: a statement may not update the same conflicting row twice
+    rows = list({row["id"]: row for row in rows}.values())
+    for start in range(0, len(rows), UPSERT_CHUNK):
+        stmt = insert(model.__table__).values(rows[start:start + UPSERT_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_={column: stmt.excluded[column] for column in update_columns}
+        )
+        session.execute(stmt)
+
+def copy_upsert_rows(session, model, rows, update_columns):
+    # COPY into a staging table, then merge it with a single INSERT ... SELECT ... ON CONFLICT
+    if not rows:
+        return
+    if session.get_bind().dialect.driver != "psycopg2":
+        # dialect-neutral fallback: SELECT then INSERT/UPDATE per row
+        for row in rows:
+            session.merge(model(**row))
+        return
+
+    table = model.__tablename__
+    staging = f"{table}_staging"
+    columns = list(rows[0])
+    column_list = ", ".join(columns)
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+    with session.connection().connection.cursor() as cursor:
+        cursor.execute(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS)")
+        _copy(cursor, staging, columns, rows)
+        # DISTINCT ON: ON CONFLICT DO UPDATE cannot touch the same row twice in one statement
+        cursor.execute(
+            f"INSERT INTO {table} ({column_list}) "
+            f"SELECT DISTINCT ON (id) {column_list} FROM {staging} "
+            f"ON CONFLICT (id) DO UPDATE SET {updates}"
+        )
+        cursor.execute(f"DROP TABLE {staging}")
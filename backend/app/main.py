@@ -1,10 +1,12 @@
 # backend/app/main.py
-from fastapi import FastAPI, HTTPException
-from .db import SessionLocal, engine
+from fastapi import Depends, FastAPI, HTTPException, Query
+from sqlalchemy.orm import Session
+from .db import engine, get_db
 from .models import Base
 from .reddit_client import fetch_subreddit_data
 
 # create tables if they don't exist
+# schema upgrades and the rollup view are applied by the deploy-time migration (python -m app.schema)
 Base.metadata.create_all(bind=engine)
 
 app = FastAPI()
@@ -14,9 +16,9 @@ def health_check():
     return {"status": "ok"}
 
 @app.post("/harvest/{subreddit}")
-def harvest(subreddit: str):
+def harvest(subreddit: str, limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_db)):
     try:
-        posts = fetch_subreddit_data(subreddit)
+        posts = fetch_subreddit_data(subreddit, limit=limit, session=db)
         return {"harvested": len(posts)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
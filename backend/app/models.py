@@ -1,5 +1,5 @@
 # backend/app/models.py
-from sqlalchemy import Column, String, Integer, Float, ForeignKey
+from sqlalchemy import Column, Date, String, Integer, Float, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -10,13 +10,15 @@ class Post(Base):
     id = Column(String, primary_key=True, index=True)
     title = Column(String)
     created_utc = Column(Integer)
+    # UTC calendar day of created_utc, stored so day filters and GROUP BYs skip to_timestamp() per row
+    created_day = Column(Date, index=True)
     comments = relationship("Comment", back_populates="post")
     predictions = relationship("Prediction", back_populates="post")
 
 class Comment(Base):
     __tablename__ = "comments"
     id = Column(String, primary_key=True, index=True)
-    post_id = Column(String, ForeignKey("posts.id"))
+    post_id = Column(String, ForeignKey("posts.id"), index=True)
     body = Column(String)
     created_utc = Column(Integer)
     post = relationship("Post", back_populates="comments")
@@ -24,7 +26,7 @@ class Comment(Base):
 class Prediction(Base):
     __tablename__ = "predictions"
     id = Column(Integer, primary_key=True, autoincrement=True)
-    post_id = Column(String, ForeignKey("posts.id"))
+    post_id = Column(String, ForeignKey("posts.id"), index=True)
     emotion = Column(String)
     score = Column(Float)
     created_utc = Column(Integer)
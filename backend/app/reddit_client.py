@@ -1,9 +1,20 @@
 # backend/app/reddit_client.py
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 import praw
-from .db import SessionLocal
+from .db import SessionLocal, copy_upsert_rows, upsert_rows
 from .models import Post, Comment
 
+# comment-tree requests in flight per process; pacing is left to prawcore, which reads
+# Reddit's X-Ratelimit-* headers (a per-client-id budget averaged over 10 minutes)
+FETCH_WORKERS = int(os.getenv("REDDIT_FETCH_WORKERS", "8"))
+
+_local = threading.local()
+_pool = None
+_pool_lock = threading.Lock()
+
 def get_reddit():
     return praw.Reddit(
         client_id=os.getenv("REDDIT_CLIENT_ID"),
@@ -11,31 +22,64 @@ def get_reddit():
         user_agent=os.getenv("REDDIT_USER_AGENT")
     )
 
-def fetch_subreddit_data(subreddit_name: str, limit: int = 100):
-    reddit = get_reddit()
-    session = SessionLocal()
-    fetched = []
-
-    for submission in reddit.subreddit(subreddit_name).new(limit=limit):
-        post = Post(
-            id=submission.id,
-            title=submission.title,
-            created_utc=int(submission.created_utc)
-        )
-        session.merge(post)
-
-        submission.comments.replace_more(limit=0)
-        for c in submission.comments.list():
-            comment = Comment(
-                id=c.id,
-                post_id=submission.id,
-                body=c.body,
-                created_utc=int(c.created_utc)
-            )
-            session.merge(comment)
-
-        fetched.append(post)
+def _thread_reddit():
+    # praw.Reddit is not thread-safe, so each pool thread keeps its own client for the process lifetime
+    if not hasattr(_local, "reddit"):
+        _local.reddit = get_reddit()
+    return _local.reddit
+
+def _fetch_pool():
+    # one long-lived pool, so its threads (and their clients and OAuth tokens) outlive a single harvest
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+        return _pool
+
+def _fetch_comments(submission_id: str):
+    submission = _thread_reddit().submission(id=submission_id)
+    submission.comments.replace_more(limit=0)
+    return [
+        {
+            "id": c.id,
+            "post_id": submission_id,
+            "body": c.body,
+            "created_utc": int(c.created_utc)
+        }
+        for c in submission.comments.list()
+    ]
+
+def _post_row(submission):
+    created_utc = int(submission.created_utc)
+    return {
+        "id": submission.id,
+        "title": submission.title,
+        "created_utc": created_utc,
+        "created_day": datetime.fromtimestamp(created_utc, timezone.utc).date()
+    }
+
+def fetch_subreddit_data(subreddit_name: str, limit: int = 100, session=None):
+    reddit = _thread_reddit()
+    owns_session = session is None
+    if owns_session:
+        session = SessionLocal()
+
+    post_rows = [
+        _post_row(submission)
+        for submission in reddit.subreddit(subreddit_name).new(limit=limit)
+    ]
+
+    # one comment-tree request per post; overlap their latency, at most FETCH_WORKERS at a time
+    comment_rows = [
+        row
+        for rows in _fetch_pool().map(_fetch_comments, [p["id"] for p in post_rows])
+        for row in rows
+    ]
 
+    # posts first so the comments' foreign keys resolve
+    upsert_rows(session, Post, post_rows, ["title"])
+    copy_upsert_rows(session, Comment, comment_rows, ["body"])
     session.commit()
-    session.close()
-    return fetched
+    if owns_session:
+        session.close()
+    return post_rows
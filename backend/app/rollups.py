@@ -0,0 +1,30 @@
+# backend/app/rollups.py
+from sqlalchemy import text
+
+# per-day emotion counts for the dashboard, refreshed by the DAG after each prediction run
+CREATE_DAILY_EMOTION_COUNTS = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS daily_emotion_counts AS
+SELECT
+  p.created_day AS day,
+  pr.emotion,
+  COUNT(*) AS count
+FROM predictions pr
+JOIN posts p ON pr.post_id = p.id
+GROUP BY p.created_day, pr.emotion
+"""
+
+# REFRESH ... CONCURRENTLY needs a unique index on the view
+CREATE_DAILY_EMOTION_COUNTS_INDEX = """
+CREATE UNIQUE INDEX IF NOT EXISTS ix_daily_emotion_counts_day_emotion
+ON daily_emotion_counts (day, emotion)
+"""
+
+def create_rollups(bind):
+    with bind.begin() as conn:
+        conn.execute(text(CREATE_DAILY_EMOTION_COUNTS))
+        conn.execute(text(CREATE_DAILY_EMOTION_COUNTS_INDEX))
+
+def refresh_rollups(bind):
+    create_rollups(bind)
+    with bind.begin() as conn:
+        conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY daily_emotion_counts"))
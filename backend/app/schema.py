@@ -0,0 +1,34 @@
+# backend/app/schema.py
+from sqlalchemy import text
+from .models import Base
+from .rollups import create_rollups
+
+# idempotent DDL for databases created before these columns/indexes were added to models.py
+UPGRADES = [
+    "CREATE INDEX IF NOT EXISTS ix_comments_post_id ON comments (post_id)",
+    "CREATE INDEX IF NOT EXISTS ix_predictions_post_id ON predictions (post_id)",
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS created_day date",
+    # databases upgraded while created_day was a generated column keep their values as plain data
+    "ALTER TABLE posts ALTER COLUMN created_day DROP EXPRESSION IF EXISTS",
+    """
+    UPDATE posts SET created_day = DATE '1970-01-01' + created_utc / 86400
+    WHERE created_day IS NULL AND created_utc IS NOT NULL
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_posts_created_day ON posts (created_day)",
+]
+
+def upgrade_schema(bind):
+    with bind.begin() as conn:
+        for ddl in UPGRADES:
+            conn.execute(text(ddl))
+
+def migrate(bind):
+    # run once per deploy, before the backend and DAG touch the new columns or the rollup view
+    Base.metadata.create_all(bind)
+    upgrade_schema(bind)
+    create_rollups(bind)
+
+if __name__ == "__main__":
+    from .db import engine
+    migrate(engine)
+    print("✅ Schema migrated.")
@@ -26,6 +26,11 @@ kubectl -n "${NAMESPACE}" apply -f infra/k8s/airflow-deployment.yaml
 kubectl -n "${NAMESPACE}" apply -f infra/k8s/airflow-service.yaml
 kubectl -n "${NAMESPACE}" apply -f infra/k8s/backend-deployment.yaml
 kubectl -n "${NAMESPACE}" apply -f infra/k8s/backend-service.yaml
+
+echo "🗄️  Migrating the database schema…"
+kubectl -n "${NAMESPACE}" rollout status deployment/backend
+kubectl -n "${NAMESPACE}" exec deployment/backend -- python -m app.schema
+
 kubectl -n "${NAMESPACE}" apply -f infra/k8s/frontend-deployment.yaml
 kubectl -n "${NAMESPACE}" apply -f infra/k8s/frontend-service.yaml
 kubectl -n "${NAMESPACE}" apply -f infra/k8s/ingress.yaml
@@ -0,0 +1,19 @@
+# scripts/export_onnx.py
+import os
+from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+EMOTION_MODEL = "bhadresh-savani/albert-base-v2-emotion"
+EMOTION_ONNX_DIR = os.getenv("EMOTION_ONNX_DIR", "models/emotion-onnx")
+
+if __name__ == "__main__":
+    model = ORTModelForSequenceClassification.from_pretrained(EMOTION_MODEL, export=True)
+    tokenizer = AutoTokenizer.from_pretrained(EMOTION_MODEL)
+
+    # dynamic int8 quantization, weights only; activations are quantized at runtime
+    quantizer = ORTQuantizer.from_pretrained(model)
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=EMOTION_ONNX_DIR, quantization_config=qconfig)
+    tokenizer.save_pretrained(EMOTION_ONNX_DIR)
+    print(f"✅ Quantized ONNX model written to {EMOTION_ONNX_DIR}.")
@@ -1,7 +1,7 @@
 # scripts/init_db.py
 import os
 from sqlalchemy import create_engine
-from backend.app.models import Base
+from backend.app.schema import migrate
 
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -10,5 +10,5 @@ DATABASE_URL = os.getenv(
 engine = create_engine(DATABASE_URL)
 
 if __name__ == "__main__":
-    Base.metadata.create_all(engine)
-    print("✅ Tables created.")
+    migrate(engine)
+    print("✅ Tables and rollups created.")